@@ -306,6 +306,8 @@ def get_leaderboard() -> Response:
 
     Query Parameters:
         - sort (str): The field to sort by ('wins', 'battles', or 'win_pct'). Default is 'wins'.
+        - limit (int): The maximum number of meals to return. Default is 100.
+        - offset (int): The number of top meals to skip. Default is 0.
 
     Returns:
         JSON response with a sorted leaderboard of meals.
@@ -314,9 +316,11 @@ def get_leaderboard() -> Response:
     """
     try:
         sort_by = request.args.get('sort', 'wins')  # Default sort by wins
-        app.logger.info("Generating leaderboard sorted by %s", sort_by)
+        limit = request.args.get('limit', 100, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        app.logger.info("Generating leaderboard sorted by %s (limit=%s, offset=%s)", sort_by, limit, offset)
 
-        leaderboard_data = kitchen_model.get_leaderboard(sort_by)
+        leaderboard_data = kitchen_model.get_leaderboard(sort_by, limit, offset)
 
         return make_response(jsonify({'status': 'success', 'leaderboard': leaderboard_data}), 200)
     except Exception as e:
@@ -4,12 +4,15 @@ statistics and provides database management for meals, letting creation, retriev
 and updating of meal data, also to track meal battle statistics.
 """
 
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
+import functools
+import itertools
 import logging
 import sqlite3
-from typing import Any
+from typing import Any, Iterator, Optional
 
-from meal_max.utils.sql_utils import get_db_connection
+from meal_max.utils.sql_utils import call_after_commit, get_db_connection, require_transaction
 from meal_max.utils.logger import configure_logger
 
 
@@ -17,10 +20,66 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-@dataclass
+# ids bound per IN (...) query, below SQLite's default limit of 999 parameters
+_MAX_IDS_PER_QUERY = 500
+
+# wins added to a meal for each battle result accepted by update_meal_stats
+_WIN_INCREMENT = {'win': 1, 'loss': 0}
+
+# generation of the meal lookup caches, bumped by clear_meal_cache
+_cache_generations = itertools.count()
+_cache_generation = next(_cache_generations)
+
+# allowed values for Meal.difficulty
+_VALID_DIFFICULTY: frozenset[str] = frozenset({'LOW', 'MED', 'HIGH'})
+
+# columns of a meals row that make up a Meal
+_MEAL_FIELDS = ('id', 'meal', 'cuisine', 'price', 'difficulty')
+
+# SQL is kept in constants so every call sends identical text and reuses the
+# statement already prepared in the connection's statement cache.
+_SQL_INSERT_MEAL = """
+    INSERT INTO meals (meal, cuisine, price, difficulty) VALUES (?, ?, ?, ?)
+    ON CONFLICT(meal) DO NOTHING
+"""
+_SQL_GET_DELETED = "SELECT deleted FROM meals WHERE id = ?"
+_SQL_DELETE_MEAL = "UPDATE meals SET deleted = 1 WHERE id = ? AND deleted = 0"
+_SQL_GET_MEAL_BY_ID = "SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id = ?"
+_SQL_GET_MEAL_BY_NAME = "SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE meal = ?"
+_SQL_GET_MEALS_BY_IDS = "SELECT id, meal, cuisine, price, difficulty FROM meals WHERE deleted = 0 AND id IN ({placeholders})"
+_SQL_UPDATE_MEAL_STATS = "UPDATE meals SET battles = battles + 1, wins = wins + ? WHERE id = ? AND deleted = 0"
+
+# win_pct is rounded to a percentage in SQL; sorting uses the unrounded
+# ratio so it matches the expression index on meals.
+_SQL_LEADERBOARD = """
+    SELECT id, meal, cuisine, price, difficulty, battles, wins,
+           ROUND(wins * 100.0 / battles, 1) AS win_pct
+    FROM meals WHERE deleted = 0 AND battles > 0
+"""
+
+# allowed get_leaderboard sort_by values and the expression each sorts on
+_ORDER_COLS = {
+    "wins": "wins",
+    "win_pct": "(wins * 1.0 / battles)",
+}
+
+# one complete leaderboard statement per sort_by value
+_SQL_LEADERBOARD_BY = {
+    sort_by: f"{_SQL_LEADERBOARD} ORDER BY {col} DESC LIMIT ? OFFSET ?"
+    for sort_by, col in _ORDER_COLS.items()
+}
+
+# largest page of leaderboard entries returned by one get_leaderboard call
+MAX_LEADERBOARD_LIMIT = 1000
+
+
+@dataclass(frozen=True)
 class Meal:
     """A class to represent a meal with its properties.
 
+    Meals are immutable and use __slots__ instead of a per-instance __dict__,
+    so they are small and safe to share between threads.
+
     Attributes:
         id (int): The identifier for the meal.
         meal (str): Name of the meal.
@@ -31,6 +90,9 @@ class Meal:
     Raises:
         ValueError: If price is negative or difficulty is not one of the allowed values.
     """
+    # Declared by hand because dataclass(slots=True) needs Python 3.10.
+    __slots__ = ('id', 'meal', 'cuisine', 'price', 'difficulty')
+
     id: int
     meal: str
     cuisine: str
@@ -45,11 +107,73 @@ class Meal:
         """
         if self.price < 0:
             raise ValueError("Price must be a positive value.")
-        if self.difficulty not in ['LOW', 'MED', 'HIGH']:
+        if self.difficulty not in _VALID_DIFFICULTY:
             raise ValueError("Difficulty must be 'LOW', 'MED', or 'HIGH'.")
 
+    # Without a __dict__, copy and pickle would restore fields through the
+    # frozen __setattr__; mirror what dataclass(slots=True) generates.
+    def __getstate__(self):
+        return [getattr(self, field) for field in self.__slots__]
+
+    def __setstate__(self, state):
+        for field, value in zip(self.__slots__, state):
+            object.__setattr__(self, field, value)
+
+    @classmethod
+    def _from_db_row(cls, row: sqlite3.Row) -> "Meal":
+        """Builds a Meal from a meals row without running __post_init__.
+
+        The table's CHECK constraints already guarantee a positive price and
+        a valid difficulty, so the row does not need validating again.
+        """
+        meal = object.__new__(cls)
+        for field in _MEAL_FIELDS:
+            object.__setattr__(meal, field, row[field])
+        return meal
+
+
+@contextmanager
+def _connection(conn: Optional[sqlite3.Connection]) -> Iterator[sqlite3.Connection]:
+    """Yields the caller's connection if one is given, else a pooled one.
 
-def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
+    Raises:
+        ValueError: If conn is given but is not inside a transaction().
+    """
+    if conn is not None:
+        require_transaction(conn)
+        yield conn
+    else:
+        with get_db_connection() as pooled_conn:
+            yield pooled_conn
+
+
+@contextmanager
+def _savepoint(conn: sqlite3.Connection, name: str) -> Iterator[None]:
+    """Undoes the block's writes if it raises, keeping conn's transaction open."""
+    conn.execute(f"SAVEPOINT {name}")
+    try:
+        yield
+    except BaseException:
+        conn.execute(f"ROLLBACK TO {name}")
+        raise
+    finally:
+        conn.execute(f"RELEASE {name}")
+
+
+def _validate_meal_fields(price: float, difficulty: str) -> None:
+    """Checks the price and difficulty of a meal before it is written.
+
+    Raises:
+        ValueError: If price is not positive or difficulty is invalid.
+    """
+    if not isinstance(price, (int, float)) or price <= 0:
+        raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
+    if difficulty not in _VALID_DIFFICULTY:
+        raise ValueError(f"Invalid difficulty level: {difficulty}. Must be 'LOW', 'MED', or 'HIGH'.")
+
+
+def create_meal(meal: str, cuisine: str, price: float, difficulty: str,
+                conn: Optional[sqlite3.Connection] = None) -> None:
     """Creates a new meal in the database.
 
     Args:
@@ -57,6 +181,9 @@ def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
         cuisine (str): The cuisine the meal belongs to.
         price (float): The price (positive) of the meal.
         difficulty (str): Preparing difficulty of meal.
+        conn (sqlite3.Connection, optional): Connection of an open
+            transaction() to run in. The caller then owns the commit.
+            Any other connection is rejected.
         
     Returns:
         int: The ID of the newly created meal.
@@ -69,56 +196,124 @@ def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
     Example:
         >>> create_meal("Spaghetti", "Turkish", 12.99, "LOW")
     """
-    if not isinstance(price, (int, float)) or price <= 0:
-        raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
-    if difficulty not in ['LOW', 'MED', 'HIGH']:
-        raise ValueError(f"Invalid difficulty level: {difficulty}. Must be 'LOW', 'MED', or 'HIGH'.")
+    _validate_meal_fields(price, difficulty)
 
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO meals (meal, cuisine, price, difficulty)
-                VALUES (?, ?, ?, ?)
-            """, (meal, cuisine, price, difficulty))
-            conn.commit()
+        with _connection(conn) as active_conn:
+            cursor = active_conn.cursor()
+            cursor.execute(_SQL_INSERT_MEAL, (meal, cuisine, price, difficulty))
+            if cursor.rowcount == 0:
+                logger.error("Duplicate meal name: %s", meal)
+                raise ValueError(f"Meal with name '{meal}' already exists")
+            if conn is None:
+                active_conn.commit()
 
             logger.info("Meal successfully added to the database: %s", meal)
 
-    except sqlite3.IntegrityError:
-        logger.error("Duplicate meal name: %s", meal)
-        raise ValueError(f"Meal with name '{meal}' already exists")
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+def create_meals_bulk(meals: list[tuple], ignore_duplicates: bool = False,
+                      conn: Optional[sqlite3.Connection] = None) -> None:
+    """Creates many meals in the database within a single transaction.
+
+    Every row is validated before anything is written, so an invalid row
+    leaves the database untouched. A batch rejected for a duplicate name is
+    discarded as a whole, including inside a caller's transaction().
+
+    Args:
+        meals (list[tuple]): Rows of (meal, cuisine, price, difficulty).
+        ignore_duplicates (bool): If True, rows whose name already exists are
+            skipped instead of failing the whole batch.
+        conn (sqlite3.Connection, optional): Connection of an open
+            transaction() to run in. The caller then owns the commit.
+            Any other connection is rejected.
+
+    Raises:
+        ValueError: If any row has an invalid price or difficulty, or a meal
+            name already exists and ignore_duplicates is False.
+        sqlite3.Error: For any different error with the database.
+
+    Example:
+        >>> create_meals_bulk([("Manti", "Turkish", 12.99, "MED"),
+        ...                    ("Sushi Roll", "Japanese", 15.99, "HIGH")])
+    """
+    rows = []
+    for meal, cuisine, price, difficulty in meals:
+        _validate_meal_fields(price, difficulty)
+        rows.append((meal, cuisine, price, difficulty))
+
+    if not rows:
+        return
+
+    try:
+        with _connection(conn) as active_conn:
+            cursor = active_conn.cursor()
+            # On a caller's connection, a savepoint lets a rejected batch be
+            # undone without ending their transaction. On our own connection,
+            # raising before the commit is enough: the pool rolls it back.
+            batch = nullcontext() if conn is None else _savepoint(active_conn, "create_meals_bulk")
+            with batch:
+                cursor.executemany(_SQL_INSERT_MEAL, rows)
+                # Rows skipped by ON CONFLICT are left out of rowcount.
+                if cursor.rowcount < len(rows) and not ignore_duplicates:
+                    logger.error("Duplicate meal name in bulk insert")
+                    raise ValueError("One or more meals already exist")
+            if conn is None:
+                active_conn.commit()
+
+            logger.info("%d meals successfully added to the database", cursor.rowcount)
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
         raise e
 
 
-def delete_meal(meal_id: int) -> None:
+def _raise_missing_or_deleted(cursor: sqlite3.Cursor, meal_id: int) -> None:
+    """Explains why a conditional UPDATE on a meal matched no rows.
+
+    Raises:
+        ValueError: Always; says whether the meal is missing or deleted.
+    """
+    cursor.execute(_SQL_GET_DELETED, (meal_id,))
+    row = cursor.fetchone()
+    if row is None:
+        logger.info("Meal with ID %s not found", meal_id)
+        raise ValueError(f"Meal with ID {meal_id} not found")
+    if row[0]:
+        logger.info("Meal with ID %s has been deleted", meal_id)
+        raise ValueError(f"Meal with ID {meal_id} has been deleted")
+    raise ValueError(f"Meal with ID {meal_id} could not be updated")
+
+
+def delete_meal(meal_id: int, conn: Optional[sqlite3.Connection] = None) -> None:
     """Deletes and marks the meal as deleted.
 
     Args:
         meal_id: The ID of the meal to delete.
+        conn (sqlite3.Connection, optional): Connection of an open
+            transaction() to run in. The caller then owns the commit.
+            Any other connection is rejected.
 
     Raises:
         ValueError: If the meal is not found or has already been deleted.
         sqlite3.Error: For any different error with the database. 
     """
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
-            try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
-                    logger.info("Meal with ID %s has already been deleted", meal_id)
-                    raise ValueError(f"Meal with ID {meal_id} has been deleted")
-            except TypeError:
-                logger.info("Meal with ID %s not found", meal_id)
-                raise ValueError(f"Meal with ID {meal_id} not found")
-
-            cursor.execute("UPDATE meals SET deleted = TRUE WHERE id = ?", (meal_id,))
-            conn.commit()
+        with _connection(conn) as active_conn:
+            cursor = active_conn.cursor()
+            cursor.execute(_SQL_DELETE_MEAL, (meal_id,))
+            if cursor.rowcount == 0:
+                _raise_missing_or_deleted(cursor, meal_id)
+            # Clear cached lookups only once the delete is committed; a lookup
+            # cached before then would still see the meal.
+            if conn is None:
+                active_conn.commit()
+                clear_meal_cache()
+            else:
+                call_after_commit(conn, clear_meal_cache)
 
             logger.info("Meal with ID %s marked as deleted.", meal_id)
 
@@ -126,66 +321,132 @@ def delete_meal(meal_id: int) -> None:
         logger.error("Database error: %s", str(e))
         raise e
 
-def get_leaderboard(sort_by: str="wins") -> dict[str, Any]:
-    """Gets the leaderboard of meals in the form of dictionary.
+def _iter_rows(cursor: sqlite3.Cursor, size: int = 1000) -> Iterator[sqlite3.Row]:
+    """Yields the rows of an executed query, fetching them in batches of size."""
+    while rows := cursor.fetchmany(size):
+        yield from rows
+
+
+def _check_sort_by(sort_by: str) -> None:
+    """Raises ValueError unless sort_by is a supported leaderboard ordering."""
+    if sort_by not in _SQL_LEADERBOARD_BY:
+        logger.error("Invalid sort_by parameter: %s", sort_by)
+        raise ValueError("Invalid sort_by parameter: %s" % sort_by)
+
+
+def iter_leaderboard(sort_by: str="wins", limit: Optional[int]=None,
+                     offset: int=0) -> Iterator[dict[str, Any]]:
+    """Streams leaderboard entries instead of building the whole list.
+
+    Rows are fetched in batches as the iterator is consumed, so a caller that
+    stops early never loads the rest. The pooled connection is held until the
+    iterator is exhausted or closed.
 
     Args:
         sort_by (str): Sorting criteria, either "wins" or "win_pct".
+        limit (int, optional): Maximum number of entries; None streams all.
+        offset (int): Number of top entries to skip, for paging.
 
     Returns:
-        dict[str, Any]: The dictionary having leaderboard entries for the meals.
-     
+        Iterator[dict[str, Any]]: Leaderboard entries, best first.
+
     Raises:
-        ValueError: If sorting criteria parameter is invalid.
-        sqlite3.Error: For any different error with the database. 
+        ValueError: If sorting criteria, limit or offset parameter is invalid.
+        sqlite3.Error: For any different error with the database, raised
+            while iterating.
 
     Example:
-        >>> leaderboard = get_leaderboard(sort_by="win_pct")
-        >>> print(leaderboard[0]['win_pct'])
-    """
-    query = """
-        SELECT id, meal, cuisine, price, difficulty, battles, wins, (wins * 1.0 / battles) AS win_pct
-        FROM meals WHERE deleted = false AND battles > 0
+        >>> for entry in iter_leaderboard(sort_by="wins"):
+        ...     print(entry['meal'], entry['wins'])
     """
+    _check_sort_by(sort_by)
+    if limit is not None and limit <= 0:
+        logger.error("Invalid limit parameter: %s", limit)
+        raise ValueError(f"Invalid limit parameter: {limit}. Must be positive.")
+    if offset < 0:
+        logger.error("Invalid offset parameter: %s", offset)
+        raise ValueError(f"Invalid offset parameter: {offset}. Must not be negative.")
 
-    if sort_by == "win_pct":
-        query += " ORDER BY win_pct DESC"
-    elif sort_by == "wins":
-        query += " ORDER BY wins DESC"
-    else:
-        logger.error("Invalid sort_by parameter: %s", sort_by)
-        raise ValueError("Invalid sort_by parameter: %s" % sort_by)
+    # SQLite treats a negative LIMIT as no limit
+    params = (-1 if limit is None else limit, offset)
+    return _stream_leaderboard(_SQL_LEADERBOARD_BY[sort_by], params)
 
+
+def _stream_leaderboard(query: str, params: tuple) -> Iterator[dict[str, Any]]:
+    """Runs a leaderboard query and yields its rows as dicts."""
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-
-        leaderboard = []
-        for row in rows:
-            meal = {
-                'id': row[0],
-                'meal': row[1],
-                'cuisine': row[2],
-                'price': row[3],
-                'difficulty': row[4],
-                'battles': row[5],
-                'wins': row[6],
-                'win_pct': round(row[7] * 100, 1)  # Convert to percentage
-            }
-            leaderboard.append(meal)
-
-        logger.info("Leaderboard retrieved successfully")
-        return leaderboard
+            cursor.execute(query, params)
+            for row in _iter_rows(cursor):
+                yield dict(row)
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
         raise e
 
+
+def get_leaderboard(sort_by: str="wins", limit: int=100, offset: int=0) -> list[dict[str, Any]]:
+    """Gets the leaderboard of meals as a list of dictionaries.
+
+    Args:
+        sort_by (str): Sorting criteria, either "wins" or "win_pct".
+        limit (int): Maximum number of entries to return, at most
+            MAX_LEADERBOARD_LIMIT.
+        offset (int): Number of top entries to skip, for paging.
+
+    Returns:
+        list[dict[str, Any]]: The leaderboard entries for the meals.
+     
+    Raises:
+        ValueError: If sorting criteria, limit or offset parameter is invalid.
+        sqlite3.Error: For any different error with the database. 
+
+    Example:
+        >>> leaderboard = get_leaderboard(sort_by="win_pct")
+        >>> print(leaderboard[0]['win_pct'])
+    """
+    if not 0 < limit <= MAX_LEADERBOARD_LIMIT:
+        logger.error("Invalid limit parameter: %s", limit)
+        raise ValueError(f"Invalid limit parameter: {limit}. Must be between 1 and {MAX_LEADERBOARD_LIMIT}.")
+
+    leaderboard = list(iter_leaderboard(sort_by, limit, offset))
+
+    logger.info("Leaderboard retrieved successfully")
+    return leaderboard
+
+
+def get_leaderboard_top_n(n: int, sort_by: str="wins") -> list[dict[str, Any]]:
+    """Gets the n best meals on the leaderboard.
+
+    Args:
+        n (int): Number of entries to return; 0 returns an empty list.
+        sort_by (str): Sorting criteria, either "wins" or "win_pct".
+
+    Returns:
+        list[dict[str, Any]]: At most n leaderboard entries, best first.
+
+    Raises:
+        ValueError: If sorting criteria is invalid or n is negative.
+        sqlite3.Error: For any different error with the database.
+
+    Example:
+        >>> top_three = get_leaderboard_top_n(3, sort_by="win_pct")
+    """
+    if n < 0:
+        logger.error("Invalid n parameter: %s", n)
+        raise ValueError(f"Invalid n parameter: {n}. Must not be negative.")
+    if n == 0:
+        _check_sort_by(sort_by)
+        return []
+
+    return list(iter_leaderboard(sort_by, limit=n))
+
 def get_meal_by_id(meal_id: int) -> Meal:
     """Retrieves a meal from the database by its ID.
 
+    Results are cached; the cache is cleared whenever a meal is deleted.
+
     Args:
         meal_id(int): The ID of the meal to retrieve.
 
@@ -201,17 +462,23 @@ def get_meal_by_id(meal_id: int) -> Meal:
         >>> print(meal.cuisine)
         Turkish
     """
+    return _fetch_meal_by_id(meal_id, _cache_generation)
+
+
+@functools.lru_cache(maxsize=1024)
+def _fetch_meal_by_id(meal_id: int, generation: int) -> Meal:
+    """Loads a meal by id; generation only keys the cache entry."""
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id = ?", (meal_id,))
+            cursor.execute(_SQL_GET_MEAL_BY_ID, (meal_id,))
             row = cursor.fetchone()
 
             if row:
-                if row[5]:
+                if row['deleted']:
                     logger.info("Meal with ID %s has been deleted", meal_id)
                     raise ValueError(f"Meal with ID {meal_id} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
+                return Meal._from_db_row(row)
             else:
                 logger.info("Meal with ID %s not found", meal_id)
                 raise ValueError(f"Meal with ID {meal_id} not found")
@@ -224,6 +491,8 @@ def get_meal_by_id(meal_id: int) -> Meal:
 def get_meal_by_name(meal_name: str) -> Meal:
     """Retrieves a meal from the database by its name.
 
+    Results are cached; the cache is cleared whenever a meal is deleted.
+
     Args:
         meal_name: The name of the meal to retrieve.
 
@@ -239,17 +508,23 @@ def get_meal_by_name(meal_name: str) -> Meal:
         >>> print(meal.price)
         12.99
     """
+    return _fetch_meal_by_name(meal_name, _cache_generation)
+
+
+@functools.lru_cache(maxsize=1024)
+def _fetch_meal_by_name(meal_name: str, generation: int) -> Meal:
+    """Loads a meal by name; generation only keys the cache entry."""
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE meal = ?", (meal_name,))
+            cursor.execute(_SQL_GET_MEAL_BY_NAME, (meal_name,))
             row = cursor.fetchone()
 
             if row:
-                if row[5]:
+                if row['deleted']:
                     logger.info("Meal with name %s has been deleted", meal_name)
                     raise ValueError(f"Meal with name {meal_name} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
+                return Meal._from_db_row(row)
             else:
                 logger.info("Meal with name %s not found", meal_name)
                 raise ValueError(f"Meal with name {meal_name} not found")
@@ -259,12 +534,71 @@ def get_meal_by_name(meal_name: str) -> Meal:
         raise e
 
 
-def update_meal_stats(meal_id: int, result: str) -> None:
+def clear_meal_cache() -> None:
+    """Clears the cached results of get_meal_by_id and get_meal_by_name.
+
+    Only deletion changes what those functions return: stats are not part of
+    a Meal, and lookups that fail are never cached.
+
+    Cache entries are keyed by the generation current when their lookup
+    started. Bumping it here means a lookup that read a row before the delete
+    but finishes after this call stores its stale Meal under an old
+    generation, which no later lookup asks for.
+    """
+    global _cache_generation
+    _cache_generation = next(_cache_generations)
+    _fetch_meal_by_id.cache_clear()
+    _fetch_meal_by_name.cache_clear()
+
+
+def get_meals_by_ids(meal_ids: list[int]) -> dict[int, Meal]:
+    """Retrieves many meals from the database with as few queries as possible.
+
+    Args:
+        meal_ids (list[int]): The IDs of the meals to retrieve.
+
+    Returns:
+        dict[int, Meal]: The meals found, keyed by ID. IDs that do not exist
+            or belong to deleted meals are left out.
+
+    Raises:
+        sqlite3.Error: For any different error with the database.
+
+    Example:
+        >>> meals = get_meals_by_ids([1, 2])
+        >>> print(meals[1].meal)
+        Manti
+    """
+    ids = list(dict.fromkeys(meal_ids))
+    meals = {}
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(ids), _MAX_IDS_PER_QUERY):
+                chunk = ids[start:start + _MAX_IDS_PER_QUERY]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(_SQL_GET_MEALS_BY_IDS.format(placeholders=placeholders), chunk)
+                for row in cursor.fetchall():
+                    meals[row['id']] = Meal._from_db_row(row)
+
+        logger.info("Retrieved %d of %d requested meals", len(meals), len(ids))
+        return meals
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+def update_meal_stats(meal_id: int, result: str, conn: Optional[sqlite3.Connection] = None) -> None:
     """Updates the statistics of  meal.
 
     Args:
         meal_id (int): The ID of the meal that will be updated.
         result (str): The battle outcome either 'win' or 'loss'.
+        conn (sqlite3.Connection, optional): Connection of an open
+            transaction() to run in. The caller then owns the commit.
+            Any other connection is rejected.
 
     Raises:
         ValueError:  If the result is not found or has been deleted.
@@ -273,27 +607,17 @@ def update_meal_stats(meal_id: int, result: str) -> None:
     Example:
         >>> update_meal_stats(1, 'win')  
     """
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
-            try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
-                    logger.info("Meal with ID %s has been deleted", meal_id)
-                    raise ValueError(f"Meal with ID {meal_id} has been deleted")
-            except TypeError:
-                logger.info("Meal with ID %s not found", meal_id)
-                raise ValueError(f"Meal with ID {meal_id} not found")
-
-            if result == 'win':
-                cursor.execute("UPDATE meals SET battles = battles + 1, wins = wins + 1 WHERE id = ?", (meal_id,))
-            elif result == 'loss':
-                cursor.execute("UPDATE meals SET battles = battles + 1 WHERE id = ?", (meal_id,))
-            else:
-                raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+    if result not in _WIN_INCREMENT:
+        raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
 
-            conn.commit()
+    try:
+        with _connection(conn) as active_conn:
+            cursor = active_conn.cursor()
+            cursor.execute(_SQL_UPDATE_MEAL_STATS, (_WIN_INCREMENT[result], meal_id))
+            if cursor.rowcount == 0:
+                _raise_missing_or_deleted(cursor, meal_id)
+            if conn is None:
+                active_conn.commit()
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
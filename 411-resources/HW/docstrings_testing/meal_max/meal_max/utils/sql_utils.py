@@ -1,7 +1,10 @@
 from contextlib import contextmanager
 import logging
 import os
+import queue
 import sqlite3
+import threading
+from typing import Callable
 
 from meal_max.utils.logger import configure_logger
 
@@ -13,6 +16,24 @@ configure_logger(logger)
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "/app/sql/meal_max.db")
 
+# maximum number of connections kept open by the pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+
+# seconds to wait for a free pooled connection before giving up
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# prepared statements cached per connection (sqlite3 defaults to 128)
+DB_CACHED_STATEMENTS = 256
+
+# applied once to every pooled connection when it is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA mmap_size = 268435456",
+)
+
 
 def check_database_connection():
     try:
@@ -37,6 +58,110 @@ def check_table_exists(tablename: str):
         logger.error(error_message)
         raise Exception(error_message) from e
 
+class SQLitePool:
+    """A bounded pool of reusable SQLite connections.
+
+    Connections are opened lazily, up to ``size`` of them, and handed back to
+    the pool after use instead of being closed. When every connection is in
+    use, ``acquire`` waits up to ``timeout`` seconds for one to be released.
+
+    Attributes:
+        db_path (str): Path to the SQLite database file.
+        size (int): Maximum number of open connections.
+        timeout (float): Seconds to wait for a free connection.
+    """
+
+    def __init__(self, db_path: str, size: int, timeout: float = DB_POOL_TIMEOUT):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections move between Flask worker threads, so disable the
+        # same-thread check; the pool guarantees one user at a time.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=DB_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        try:
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Takes an idle connection, opening a new one if the pool is not full.
+
+        Raises:
+            sqlite3.OperationalError: If no connection is released in time.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+
+        if not can_open:
+            try:
+                return self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise sqlite3.OperationalError(
+                    f"Timed out after {self.timeout}s waiting for a pooled database connection"
+                ) from None
+
+        try:
+            conn = self._connect()
+        except sqlite3.Error:
+            with self._lock:
+                self._opened -= 1
+            raise
+        logger.info("Opened pooled database connection (%d/%d).", self._opened, self.size)
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Returns a connection to the pool, rolling back any open transaction."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            # A connection we cannot reset is not safe to hand out again.
+            logger.error("Discarding pooled database connection: %s", str(e))
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        finally:
+            with self._lock:
+                self._opened -= 1
+
+    def close_all(self) -> None:
+        """Closes every idle connection held by the pool."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+        logger.info("Database connection pool closed.")
+
+
+_pool = SQLitePool(DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT)
+
+# callbacks waiting for the transaction() open on each connection to commit
+_after_commit: dict[sqlite3.Connection, list[Callable[[], None]]] = {}
+
+
 ###################################################
 #
 # This one yields rather than returns.
@@ -47,12 +172,65 @@ def check_table_exists(tablename: str):
 def get_db_connection():
     conn = None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = _pool.acquire()
         yield conn
     except sqlite3.Error as e:
         logger.error("Database connection error: %s", str(e))
         raise e
     finally:
         if conn:
-            conn.close()
-            logger.info("Database connection closed.")
+            _pool.release(conn)
+
+
+def require_transaction(conn: sqlite3.Connection) -> None:
+    """Checks that conn is the connection of an open transaction().
+
+    Raises:
+        ValueError: If conn was not yielded by a transaction() that is still open.
+    """
+    if conn not in _after_commit:
+        logger.error("Connection is not inside a transaction()")
+        raise ValueError("Connection is not inside a transaction()")
+
+
+def call_after_commit(conn: sqlite3.Connection, callback: Callable[[], None]) -> None:
+    """Runs callback once the transaction() open on conn commits.
+
+    The callback is dropped if the transaction rolls back.
+
+    Raises:
+        ValueError: If conn is not inside a transaction().
+    """
+    require_transaction(conn)
+    _after_commit[conn].append(callback)
+
+
+@contextmanager
+def transaction():
+    """Runs several writes on one connection and commits them once.
+
+    Pass the yielded connection as ``conn`` to the kitchen_model write
+    functions. Everything is committed when the block exits normally and
+    rolled back if it raises. Callbacks registered with call_after_commit
+    run after the commit.
+
+    Example:
+        >>> with transaction() as conn:
+        ...     update_meal_stats(1, 'win', conn=conn)
+        ...     update_meal_stats(2, 'loss', conn=conn)
+    """
+    with get_db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        callbacks = _after_commit[conn] = []
+        try:
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        finally:
+            del _after_commit[conn]
+
+    for callback in callbacks:
+        callback()
@@ -3,9 +3,17 @@ CREATE TABLE meals (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     meal TEXT NOT NULL UNIQUE,
     cuisine TEXT NOT NULL,
-    price REAL NOT NULL,
-    difficulty TEXT CHECK(difficulty IN ('HIGH', 'MED', 'LOW')),
-    battles INTEGER DEFAULT 0,
-    wins INTEGER DEFAULT 0,
-    deleted BOOLEAN DEFAULT FALSE
-);
\ No newline at end of file
+    price REAL NOT NULL CHECK(price > 0),
+    difficulty TEXT NOT NULL CHECK(difficulty IN ('HIGH', 'MED', 'LOW')),
+    battles INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    deleted INTEGER NOT NULL DEFAULT 0 CHECK(deleted IN (0, 1))
+);
+
+-- Leaderboard indexes. These are partial indexes, so their WHERE clause must
+-- match get_leaderboard's filter exactly for SQLite to use them.
+-- "meal" needs no extra index: its UNIQUE constraint already creates one.
+CREATE INDEX IF NOT EXISTS idx_meals_leaderboard_wins
+    ON meals (wins DESC) WHERE deleted = 0 AND battles > 0;
+CREATE INDEX IF NOT EXISTS idx_meals_leaderboard_win_pct
+    ON meals ((wins * 1.0 / battles) DESC) WHERE deleted = 0 AND battles > 0;
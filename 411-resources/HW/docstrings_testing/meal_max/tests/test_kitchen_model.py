@@ -1,5 +1,17 @@
+import copy
+import dataclasses
+import pickle
+from pathlib import Path
+
 import pytest
-from meal_max.models.meal import Meal, create_meal, get_meal_by_id, get_meal_by_name, delete_meal, update_meal_stats, get_leaderboard
+
+from meal_max.models.kitchen_model import (
+    Meal, clear_meal_cache, create_meal, create_meals_bulk, get_meal_by_id, get_meal_by_name,
+    get_meals_by_ids, delete_meal, update_meal_stats, get_leaderboard, get_leaderboard_top_n,
+    iter_leaderboard
+)
+from meal_max.utils import sql_utils
+from meal_max.utils.sql_utils import SQLitePool, get_db_connection, transaction
 
 @pytest.fixture
 def sample_meal1():
@@ -12,6 +24,11 @@ def sample_meal1():
         difficulty="MED"
     )
 
+@pytest.fixture
+def meal_row():
+    """Fixture to provide the database row for sample_meal1."""
+    return {"id": 1, "meal": "Manti", "cuisine": "Turkish", "price": 12.99, "difficulty": "MED", "deleted": 0}
+
 @pytest.fixture
 def sample_meal2():
     """Fixture to provide another sample meal for testing."""
@@ -30,7 +47,47 @@ def mock_db_connection(mocker):
     mock_cursor = mocker.MagicMock()
     mock_conn.__enter__.return_value = mock_conn
     mock_conn.cursor.return_value = mock_cursor
-    return mocker.patch('meal_max.utils.sql_utils.get_db_connection', return_value=mock_conn)
+    return mocker.patch('meal_max.models.kitchen_model.get_db_connection', return_value=mock_conn)
+
+@pytest.fixture
+def pooled_db(tmp_path, monkeypatch):
+    """Real meals database behind a test connection pool."""
+    schema = (Path(__file__).parent.parent / "sql" / "create_meal_table.sql").read_text()
+    pool = SQLitePool(str(tmp_path / "meal_max.db"), size=2)
+    conn = pool.acquire()
+    conn.executescript(schema)
+    pool.release(conn)
+    monkeypatch.setattr(sql_utils, "_pool", pool)
+    yield pool
+    pool.close_all()
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty meal lookup caches."""
+    clear_meal_cache()
+
+##################################################
+# Meal Class Test Cases
+##################################################
+
+def test_meal_is_frozen(sample_meal1):
+    """Test Meal instances cannot be modified."""
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        sample_meal1.price = 1.0
+
+def test_meal_has_no_instance_dict(sample_meal1):
+    """Test Meal uses slots rather than a per-instance __dict__."""
+    assert not hasattr(sample_meal1, "__dict__")
+
+def test_meal_copy_and_pickle(sample_meal1):
+    """Test Meal survives copy and a pickle round trip."""
+    assert copy.copy(sample_meal1) == sample_meal1
+    assert copy.deepcopy(sample_meal1) == sample_meal1
+    assert pickle.loads(pickle.dumps(sample_meal1)) == sample_meal1
+
+def test_meal_from_db_row(sample_meal1, meal_row):
+    """Test building a Meal from a database row."""
+    assert Meal._from_db_row(meal_row) == sample_meal1
 
 ##################################################
 # Meal Creation Test Cases
@@ -56,20 +113,74 @@ def test_create_meal_invalid_difficulty():
 
 def test_create_duplicate_meal(mock_db_connection):
     """Test create_meal raises error for duplicate meal name."""
-    mock_cursor = mock_db_connection().cursor()
-    mock_cursor.execute.side_effect = sqlite3.IntegrityError
+    mock_conn = mock_db_connection()
+    mock_cursor = mock_conn.cursor()
+    mock_cursor.rowcount = 0
     
     with pytest.raises(ValueError, match="Meal with name 'Manti' already exists"):
         create_meal("Manti", "Turkish", 12.99, "MED")
+    assert "ON CONFLICT(meal) DO NOTHING" in mock_cursor.execute.call_args[0][0]
+    mock_conn.commit.assert_not_called()
+
+def test_create_meals_bulk_success(mock_db_connection):
+    """Test bulk meal creation uses a single executemany and commit."""
+    meals = [("Manti", "Turkish", 12.99, "MED"), ("Sushi Roll", "Japanese", 15.99, "HIGH")]
+    mock_conn = mock_db_connection()
+    mock_cursor = mock_conn.cursor()
+    mock_cursor.rowcount = 2
+
+    create_meals_bulk(meals)
+    mock_cursor.executemany.assert_called_once()
+    assert "INSERT INTO meals" in mock_cursor.executemany.call_args[0][0]
+    assert mock_cursor.executemany.call_args[0][1] == meals
+    mock_conn.commit.assert_called_once()
+
+def test_create_meals_bulk_invalid_row(mock_db_connection):
+    """Test create_meals_bulk writes nothing if any row is invalid."""
+    meals = [("Manti", "Turkish", 12.99, "MED"), ("Sushi Roll", "Japanese", -1, "HIGH")]
+    with pytest.raises(ValueError, match="Invalid price: -1"):
+        create_meals_bulk(meals)
+
+    mock_db_connection().cursor().executemany.assert_not_called()
+
+def test_create_meals_bulk_duplicate(mock_db_connection):
+    """Test create_meals_bulk raises error for duplicate meal names."""
+    mock_conn = mock_db_connection()
+    mock_cursor = mock_conn.cursor()
+    mock_cursor.rowcount = 0
+
+    with pytest.raises(ValueError, match="One or more meals already exist"):
+        create_meals_bulk([("Manti", "Turkish", 12.99, "MED")])
+    mock_conn.commit.assert_not_called()
+
+def test_create_meals_bulk_ignore_duplicates(mock_db_connection):
+    """Test create_meals_bulk skips duplicates when asked to."""
+    mock_conn = mock_db_connection()
+    mock_cursor = mock_conn.cursor()
+    mock_cursor.rowcount = 1
+
+    create_meals_bulk([("Manti", "Turkish", 12.99, "MED"), ("Manti", "Turkish", 12.99, "MED")],
+                      ignore_duplicates=True)
+    mock_conn.commit.assert_called_once()
+
+def test_create_meal_with_connection(mock_db_connection, mocker, monkeypatch):
+    """Test create_meal uses a given connection and leaves the commit to the caller."""
+    conn = mocker.MagicMock()
+    monkeypatch.setitem(sql_utils._after_commit, conn, [])  # as if inside transaction()
+    create_meal("Manti", "Turkish", 12.99, "MED", conn=conn)
+
+    mock_db_connection.assert_not_called()
+    conn.cursor().execute.assert_called_once()
+    conn.commit.assert_not_called()
 
 ##################################################
 # Meal Retrieval Test Cases
 ##################################################
 
-def test_get_meal_by_id_success(mock_db_connection, sample_meal1):
+def test_get_meal_by_id_success(mock_db_connection, sample_meal1, meal_row):
     """Test successful meal getting by the meals ID."""
     mock_cursor = mock_db_connection().cursor()
-    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED", False)
+    mock_cursor.fetchone.return_value = meal_row
     
     meal = get_meal_by_id(1)
     assert meal.meal == "Manti"
@@ -85,15 +196,74 @@ def test_get_meal_by_id_not_found(mock_db_connection):
     with pytest.raises(ValueError, match="Meal with ID 999 not found"):
         get_meal_by_id(999)
 
-def test_get_meal_by_name_success(mock_db_connection, sample_meal1):
+def test_get_meal_by_id_cached(mock_db_connection, meal_row):
+    """Test repeated lookups of the same ID hit the database once."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.fetchone.return_value = meal_row
+
+    assert get_meal_by_id(1) is get_meal_by_id(1)
+    mock_cursor.execute.assert_called_once()
+
+def test_delete_meal_clears_cache(mock_db_connection, meal_row):
+    """Test deleting a meal drops cached lookups."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.fetchone.return_value = meal_row
+    get_meal_by_id(1)
+
+    mock_cursor.rowcount = 1
+    delete_meal(1)
+    mock_cursor.fetchone.return_value = {**meal_row, "deleted": 1}
+    with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
+        get_meal_by_id(1)
+
+def test_get_meal_by_id_not_cached_across_concurrent_clear(mock_db_connection, meal_row):
+    """Test a lookup that overlaps a cache clear does not serve its stale row later."""
+    mock_cursor = mock_db_connection().cursor()
+
+    def read_then_concurrent_delete():
+        clear_meal_cache()  # another thread commits a delete mid-lookup
+        return meal_row
+    mock_cursor.fetchone.side_effect = read_then_concurrent_delete
+    get_meal_by_id(1)
+
+    mock_cursor.fetchone.side_effect = None
+    mock_cursor.fetchone.return_value = {**meal_row, "deleted": 1}
+    with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
+        get_meal_by_id(1)
+
+def test_get_meal_by_name_success(mock_db_connection, sample_meal1, meal_row):
     """Test successful meal getting by name."""
     mock_cursor = mock_db_connection().cursor()
-    mock_cursor.fetchone.return_value = (1, "Manti", "Turkish", 12.99, "MED", False)
+    mock_cursor.fetchone.return_value = meal_row
     
     meal = get_meal_by_name("Manti")
     assert meal.meal == "Manti"
     assert meal.cuisine == "Turkish"
 
+def test_get_meals_by_ids_success(mock_db_connection):
+    """Test getting several meals with a single query."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.fetchall.return_value = [
+        {"id": 1, "meal": "Manti", "cuisine": "Turkish", "price": 12.99, "difficulty": "MED"},
+        {"id": 2, "meal": "Sushi Roll", "cuisine": "Japanese", "price": 15.99, "difficulty": "HIGH"}
+    ]
+
+    meals = get_meals_by_ids([1, 2, 999])
+    mock_cursor.execute.assert_called_once()
+    assert "id IN (?, ?, ?)" in mock_cursor.execute.call_args[0][0]
+    assert set(meals) == {1, 2}
+    assert meals[2].meal == "Sushi Roll"
+
+def test_get_meals_by_ids_chunks_large_requests(mock_db_connection):
+    """Test get_meals_by_ids splits large requests into several queries."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.fetchall.return_value = []
+
+    get_meals_by_ids(list(range(501)))
+    assert mock_cursor.execute.call_count == 2
+    assert len(mock_cursor.execute.call_args_list[0][0][1]) == 500
+    assert len(mock_cursor.execute.call_args_list[1][0][1]) == 1
+
 ##################################################
 # Meal Deletion Test Cases
 ##################################################
@@ -101,19 +271,38 @@ def test_get_meal_by_name_success(mock_db_connection, sample_meal1):
 def test_delete_meal_success(mock_db_connection):
     """Test successful meal delete."""
     mock_cursor = mock_db_connection().cursor()
-    mock_cursor.fetchone.return_value = (False,)
+    mock_cursor.rowcount = 1
     
     delete_meal(1)
-    assert "UPDATE meals SET deleted = TRUE" in mock_cursor.execute.call_args_list[-1][0][0]
+    assert "UPDATE meals SET deleted = 1" in mock_cursor.execute.call_args_list[-1][0][0]
 
 def test_delete_already_deleted_meal(mock_db_connection):
     """Test delete_meal raises error for already deleted meal."""
     mock_cursor = mock_db_connection().cursor()
-    mock_cursor.fetchone.return_value = (True,)
+    mock_cursor.rowcount = 0
+    mock_cursor.fetchone.return_value = (1,)
     
     with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
         delete_meal(1)
 
+def test_delete_meal_not_found(mock_db_connection):
+    """Test delete_meal raises error for non-existent ID."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.rowcount = 0
+    mock_cursor.fetchone.return_value = None
+
+    with pytest.raises(ValueError, match="Meal with ID 999 not found"):
+        delete_meal(999)
+
+def test_delete_meal_single_statement(mock_db_connection):
+    """Test delete_meal issues only the conditional UPDATE on success."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.rowcount = 1
+
+    delete_meal(1)
+    mock_cursor.execute.assert_called_once()
+    assert "WHERE id = ? AND deleted = 0" in mock_cursor.execute.call_args[0][0]
+
 ##################################################
 # Battle Statistics Test Cases
 ##################################################
@@ -121,26 +310,49 @@ def test_delete_already_deleted_meal(mock_db_connection):
 def test_update_meal_stats_win(mock_db_connection):
     """Test updating meal statistics when win."""
     mock_cursor = mock_db_connection().cursor()
-    mock_cursor.fetchone.return_value = (False,)
+    mock_cursor.rowcount = 1
     
     update_meal_stats(1, 'win')
-    assert "UPDATE meals SET battles = battles + 1, wins = wins + 1" in mock_cursor.execute.call_args_list[-1][0][0]
+    mock_cursor.execute.assert_called_once()
+    assert "UPDATE meals SET battles = battles + 1, wins = wins + ?" in mock_cursor.execute.call_args[0][0]
+    assert mock_cursor.execute.call_args[0][1] == (1, 1)
 
 def test_update_meal_stats_loss(mock_db_connection):
     """Test updating meal statistics when loss."""
     mock_cursor = mock_db_connection().cursor()
-    mock_cursor.fetchone.return_value = (False,)
+    mock_cursor.rowcount = 1
     
     update_meal_stats(1, 'loss')
-    assert "UPDATE meals SET battles = battles + 1" in mock_cursor.execute.call_args_list[-1][0][0]
+    mock_cursor.execute.assert_called_once()
+    assert "UPDATE meals SET battles = battles + 1" in mock_cursor.execute.call_args[0][0]
+    assert mock_cursor.execute.call_args[0][1] == (0, 1)
+
+def test_update_meal_stats_with_connection(mock_db_connection, mocker, monkeypatch):
+    """Test update_meal_stats uses a given connection and leaves the commit to the caller."""
+    conn = mocker.MagicMock()
+    monkeypatch.setitem(sql_utils._after_commit, conn, [])  # as if inside transaction()
+    update_meal_stats(1, 'win', conn=conn)
+
+    mock_db_connection.assert_not_called()
+    conn.cursor().execute.assert_called_once()
+    conn.commit.assert_not_called()
+
+def test_update_meal_stats_not_found(mock_db_connection):
+    """Test update_meal_stats raises error for non-existent ID."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.rowcount = 0
+    mock_cursor.fetchone.return_value = None
+
+    with pytest.raises(ValueError, match="Meal with ID 999 not found"):
+        update_meal_stats(999, 'win')
 
 def test_update_meal_stats_invalid_result(mock_db_connection):
     """Test update_meal_stats raises error for invalid result."""
     mock_cursor = mock_db_connection().cursor()
-    mock_cursor.fetchone.return_value = (False,)
     
     with pytest.raises(ValueError, match="Invalid result: draw"):
         update_meal_stats(1, 'draw')
+    mock_cursor.execute.assert_not_called()
 
 ##################################################
 # Leaderboard Test Cases
@@ -149,9 +361,12 @@ def test_update_meal_stats_invalid_result(mock_db_connection):
 def test_get_leaderboard_by_wins(mock_db_connection):
     """Test retrieve leaderboard sorted by wins."""
     mock_cursor = mock_db_connection().cursor()
-    mock_cursor.fetchall.return_value = [
-        (1, "Manti", "Turkish", 12.99, "MED", 10, 8, 0.8),
-        (2, "Sushi", "Japanese", 15.99, "HIGH", 8, 6, 0.75)
+    mock_cursor.fetchmany.side_effect = [
+        [{"id": 1, "meal": "Manti", "cuisine": "Turkish", "price": 12.99, "difficulty": "MED",
+          "battles": 10, "wins": 8, "win_pct": 80.0},
+         {"id": 2, "meal": "Sushi", "cuisine": "Japanese", "price": 15.99, "difficulty": "HIGH",
+          "battles": 8, "wins": 6, "win_pct": 75.0}],
+        []
     ]
     
     leaderboard = get_leaderboard("wins")
@@ -159,7 +374,133 @@ def test_get_leaderboard_by_wins(mock_db_connection):
     assert leaderboard[0]['wins'] == 8
     assert leaderboard[0]['win_pct'] == 80.0
 
+def test_get_leaderboard_by_win_pct(mock_db_connection):
+    """Test retrieve leaderboard sorted by win percentage."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.fetchmany.return_value = []
+
+    get_leaderboard("win_pct")
+    assert "ORDER BY (wins * 1.0 / battles) DESC" in mock_cursor.execute.call_args[0][0]
+
+def test_get_leaderboard_limit_offset(mock_db_connection):
+    """Test get_leaderboard binds limit and offset to the query."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.fetchmany.return_value = []
+
+    get_leaderboard("wins", limit=10, offset=20)
+    assert "LIMIT ? OFFSET ?" in mock_cursor.execute.call_args[0][0]
+    assert mock_cursor.execute.call_args[0][1] == (10, 20)
+
+def test_get_leaderboard_invalid_limit(mock_db_connection):
+    """Test get_leaderboard raises error for out of range limit."""
+    with pytest.raises(ValueError, match="Invalid limit parameter: 0"):
+        get_leaderboard("wins", limit=0)
+    with pytest.raises(ValueError, match="Invalid limit parameter: 1001"):
+        get_leaderboard("wins", limit=1001)
+
+def test_get_leaderboard_invalid_offset(mock_db_connection):
+    """Test get_leaderboard raises error for negative offset."""
+    with pytest.raises(ValueError, match="Invalid offset parameter: -1"):
+        get_leaderboard("wins", offset=-1)
+
+def test_iter_leaderboard_is_lazy(mock_db_connection):
+    """Test iter_leaderboard does not query until iterated."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.fetchmany.side_effect = [
+        [{"id": 1, "meal": "Manti", "cuisine": "Turkish", "price": 12.99, "difficulty": "MED",
+          "battles": 10, "wins": 8, "win_pct": 80.0}],
+        []
+    ]
+
+    entries = iter_leaderboard("wins")
+    mock_cursor.execute.assert_not_called()
+
+    assert next(entries)['meal'] == "Manti"
+    assert mock_cursor.execute.call_args[0][1] == (-1, 0)
+
+def test_iter_leaderboard_invalid_sort(mock_db_connection):
+    """Test iter_leaderboard validates sort_by before it is iterated."""
+    with pytest.raises(ValueError, match="Invalid sort_by parameter: invalid"):
+        iter_leaderboard("invalid")
+
+def test_get_leaderboard_top_n(mock_db_connection):
+    """Test get_leaderboard_top_n limits the query to n entries."""
+    mock_cursor = mock_db_connection().cursor()
+    mock_cursor.fetchmany.return_value = []
+
+    assert get_leaderboard_top_n(3, "win_pct") == []
+    assert mock_cursor.execute.call_args[0][1] == (3, 0)
+
+def test_get_leaderboard_top_n_zero(mock_db_connection):
+    """Test get_leaderboard_top_n(0) returns nothing without querying."""
+    assert get_leaderboard_top_n(0) == []
+    mock_db_connection.assert_not_called()
+
+def test_get_leaderboard_top_n_zero_invalid_sort(mock_db_connection):
+    """Test get_leaderboard_top_n(0) still rejects an invalid sort parameter."""
+    with pytest.raises(ValueError, match="Invalid sort_by parameter: invalid"):
+        get_leaderboard_top_n(0, "invalid")
+
+def test_get_leaderboard_top_n_negative(mock_db_connection):
+    """Test get_leaderboard_top_n names n in its error for negative n."""
+    with pytest.raises(ValueError, match="Invalid n parameter: -1"):
+        get_leaderboard_top_n(-1)
+
 def test_get_leaderboard_invalid_sort(mock_db_connection):
     """Test get_leaderboard raises error for invalid sort parameter."""
     with pytest.raises(ValueError, match="Invalid sort_by parameter: invalid"):
         get_leaderboard("invalid")
+
+##################################################
+# Transaction Test Cases
+##################################################
+
+def test_delete_meal_in_transaction_clears_cache_after_commit(pooled_db):
+    """Test a lookup cached inside a transaction does not outlive the delete."""
+    create_meal("Manti", "Turkish", 12.99, "MED")
+
+    with transaction() as conn:
+        delete_meal(1, conn=conn)
+        # Read through another pooled connection before the commit
+        assert get_meal_by_id(1).meal == "Manti"
+
+    with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
+        get_meal_by_id(1)
+
+def test_delete_meal_in_rolled_back_transaction(pooled_db):
+    """Test a rolled back delete leaves the meal available."""
+    create_meal("Manti", "Turkish", 12.99, "MED")
+
+    with pytest.raises(RuntimeError):
+        with transaction() as conn:
+            delete_meal(1, conn=conn)
+            raise RuntimeError("abort")
+
+    assert get_meal_by_id(1).meal == "Manti"
+
+def test_create_meals_bulk_duplicate_in_transaction(pooled_db):
+    """Test a rejected batch is discarded without ending the caller's transaction."""
+    create_meal("Manti", "Turkish", 12.99, "MED")
+
+    with transaction() as conn:
+        create_meal("Pho", "Vietnamese", 9.5, "MED", conn=conn)
+        with pytest.raises(ValueError, match="One or more meals already exist"):
+            create_meals_bulk([("Sushi Roll", "Japanese", 15.99, "HIGH"),
+                               ("Manti", "Turkish", 12.99, "MED")], conn=conn)
+
+    assert get_meal_by_name("Pho").meal == "Pho"
+    with pytest.raises(ValueError, match="Meal with name Sushi Roll not found"):
+        get_meal_by_name("Sushi Roll")
+
+def test_write_rejects_connection_outside_transaction(pooled_db):
+    """Test a connection not opened by transaction() is rejected before any write."""
+    with get_db_connection() as conn:
+        with pytest.raises(ValueError, match="not inside a transaction"):
+            create_meal("Manti", "Turkish", 12.99, "MED", conn=conn)
+        with pytest.raises(ValueError, match="not inside a transaction"):
+            create_meals_bulk([("Sushi Roll", "Japanese", 15.99, "HIGH")], conn=conn)
+        assert not conn.in_transaction
+
+    for name in ("Manti", "Sushi Roll"):
+        with pytest.raises(ValueError, match=f"Meal with name {name} not found"):
+            get_meal_by_name(name)
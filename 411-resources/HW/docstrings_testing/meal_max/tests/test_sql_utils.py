@@ -0,0 +1,136 @@
+import sqlite3
+
+import pytest
+
+from meal_max.utils import sql_utils
+from meal_max.utils.sql_utils import SQLitePool, call_after_commit, transaction
+
+@pytest.fixture
+def pool(tmp_path):
+    """Fixture to provide a small pool backed by a temporary database."""
+    pool = SQLitePool(str(tmp_path / "test.db"), size=2)
+    yield pool
+    pool.close_all()
+
+##################################################
+# Connection Pool Test Cases
+##################################################
+
+def test_pool_reuses_released_connection(pool):
+    """Test a released connection is handed out again."""
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+    pool.release(conn)
+
+def test_pool_opens_up_to_size(pool):
+    """Test the pool opens distinct connections up to its size."""
+    conn1 = pool.acquire()
+    conn2 = pool.acquire()
+    assert conn1 is not conn2
+    assert pool._opened == 2
+    pool.release(conn1)
+    pool.release(conn2)
+
+def test_pool_acquire_times_out_when_exhausted(tmp_path):
+    """Test acquire raises instead of blocking forever on an exhausted pool."""
+    pool = SQLitePool(str(tmp_path / "test.db"), size=1, timeout=0.01)
+    conn = pool.acquire()
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="Timed out"):
+            pool.acquire()
+    finally:
+        pool.release(conn)
+        pool.close_all()
+
+def test_pool_release_rolls_back_open_transaction(pool):
+    """Test uncommitted work is discarded when a connection is released."""
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    assert conn.in_transaction
+
+    pool.release(conn)
+    conn = pool.acquire()
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.release(conn)
+
+def test_pool_close_all(pool):
+    """Test close_all closes idle connections."""
+    pool.release(pool.acquire())
+    pool.close_all()
+    assert pool._opened == 0
+
+def test_pool_connection_pragmas(pool):
+    """Test new connections are opened in WAL mode with tuned settings."""
+    conn = pool.acquire()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+    pool.release(conn)
+
+##################################################
+# Transaction Test Cases
+##################################################
+
+@pytest.fixture
+def pooled_table(pool, monkeypatch):
+    """Fixture to route get_db_connection to the test pool with a table."""
+    monkeypatch.setattr(sql_utils, "_pool", pool)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    pool.release(conn)
+    return pool
+
+def count_rows(pool):
+    conn = pool.acquire()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+    finally:
+        pool.release(conn)
+
+def test_transaction_commits_once(pooled_table):
+    """Test writes in a transaction are committed together."""
+    with transaction() as conn:
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.execute("INSERT INTO t VALUES (2)")
+    assert count_rows(pooled_table) == 2
+
+def test_transaction_rolls_back_on_error(pooled_table):
+    """Test writes in a transaction are discarded if the block raises."""
+    with pytest.raises(ValueError):
+        with transaction() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise ValueError("boom")
+    assert count_rows(pooled_table) == 0
+
+def test_call_after_commit_waits_for_commit(pooled_table):
+    """Test callbacks registered in a transaction run after it commits."""
+    calls = []
+    with transaction() as conn:
+        conn.execute("INSERT INTO t VALUES (1)")
+        call_after_commit(conn, lambda: calls.append(count_rows(pooled_table)))
+        assert calls == []
+    assert calls == [1]
+
+def test_call_after_commit_dropped_on_rollback(pooled_table):
+    """Test callbacks registered in a rolled back transaction never run."""
+    calls = []
+    with pytest.raises(ValueError):
+        with transaction() as conn:
+            call_after_commit(conn, lambda: calls.append(True))
+            raise ValueError("boom")
+    assert calls == []
+
+def test_call_after_commit_rejects_connection_outside_transaction(pooled_table):
+    """Test callbacks cannot be registered on a connection with no transaction()."""
+    calls = []
+    conn = pooled_table.acquire()
+    try:
+        with pytest.raises(ValueError, match="not inside a transaction"):
+            call_after_commit(conn, lambda: calls.append(True))
+    finally:
+        pooled_table.release(conn)
+    assert calls == []